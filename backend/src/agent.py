@@ -45,7 +45,7 @@ def _safe_plugin(name: str):
     try:
         return importlib.import_module(f"livekit.plugins.{name}")
     except Exception as e:
-        logger.warning(f"Failed to import plugin livekit.plugins.{name}: {e}")
+        logger.warning("Failed to import plugin livekit.plugins.%s: %s", name, e)
         return None
 
 murf = _safe_plugin("murf")
@@ -60,7 +60,7 @@ try:
     _td = importlib.import_module("livekit.plugins.turn_detector.multilingual")
     MultilingualModel = getattr(_td, "MultilingualModel", None)
 except Exception as e:
-    logger.warning(f"Failed to import MultilingualModel: {e}")
+    logger.warning("Failed to import MultilingualModel: %s", e)
     MultilingualModel = None
 
 # In-memory mapping of room name -> improv_state (dict)
@@ -138,10 +138,10 @@ def start_state_server(port: int = 9001):
     def _serve():
         try:
             server = ThreadingHTTPServer(("0.0.0.0", port), handler)
-            logger.info(f"State server listening on http://0.0.0.0:{port}")
+            logger.info("State server listening on http://0.0.0.0:%s", port)
             server.serve_forever()
         except Exception as e:
-            logger.error(f"State server failed: {e}")
+            logger.error("State server failed: %s", e)
 
     t = threading.Thread(target=_serve, daemon=True)
     t.start()
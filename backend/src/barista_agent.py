@@ -1,7 +1,8 @@
+import asyncio
 import logging
 import os
 import json
-from datetime import datetime
+import time
 from typing import List
 
 from dotenv import load_dotenv
@@ -27,6 +28,12 @@ logger = logging.getLogger("agent")
 load_dotenv(".env.local")
 
 
+def _write_order_sync(path: str, order: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(order, f, indent=2, ensure_ascii=False)
+
+
 @function_tool
 async def save_order(
     ctx: RunContext,
@@ -48,17 +55,16 @@ async def save_order(
         "name": name,
     }
 
-    # Ensure orders directory exists next to this file (backend/orders)
+    # Orders are written next to this file (backend/orders)
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     orders_dir = os.path.join(base_dir, "orders")
-    os.makedirs(orders_dir, exist_ok=True)
 
-    ts = datetime.utcnow().isoformat(timespec="seconds").replace(":", "-")
+    ts = time.strftime("%Y-%m-%dT%H-%M-%S", time.gmtime())
     filename = f"order_{ts}.json"
     path = os.path.join(orders_dir, filename)
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(order, f, indent=2, ensure_ascii=False)
+    # Keep disk I/O off the event loop so audio keeps flowing.
+    await asyncio.to_thread(_write_order_sync, path, order)
 
     return f"saved:{path}"
 
@@ -159,7 +165,7 @@ async def entrypoint(ctx: JobContext):
 
     async def log_usage():
         summary = usage_collector.get_summary()
-        logger.info(f"Usage: {summary}")
+        logger.info("Usage: %s", summary)
 
     ctx.add_shutdown_callback(log_usage)
 
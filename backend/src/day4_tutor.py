@@ -3,6 +3,7 @@ import logging
 import os
 import json
 import re
+from types import MappingProxyType
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
@@ -35,10 +36,22 @@ def load_content() -> List[Dict]:
         with open(CONTENT_PATH, "r", encoding="utf-8") as f:
             return json.load(f)
     except Exception as e:
-        logger.error(f"Error loading content: {e}")
+        logger.error("Error loading content: %s", e)
         return []
 
-CONTENT = load_content()
+def index_by_id(concepts) -> Dict:
+    """Map concept id -> concept; the first concept with a given id wins."""
+    by_id: Dict = {}
+    for c in concepts:
+        if c.get("id") is not None:
+            by_id.setdefault(c["id"], c)
+    return by_id
+
+# Loaded once per process. CONCEPTS keeps every concept in file order (for the
+# prompt list and title lookups); CONTENT is a read-only id index over it. Both
+# are shallow: the concept dicts are shared, so callers must not modify them.
+CONCEPTS = tuple(load_content())
+CONTENT = MappingProxyType(index_by_id(CONCEPTS))
 
 # Voice mapping per mode (Murf voices)
 VOICE_MAP = {
@@ -50,15 +63,18 @@ VOICE_MAP = {
 @function_tool
 async def get_concept(ctx: RunContext, concept_id: Optional[str] = None) -> Dict:
     """Return a concept object from the content file by id or default to first."""
-    if not CONTENT:
+    if not CONCEPTS:
         return {}
+    default = CONCEPTS[0]
     if not concept_id:
-        return CONTENT[0]
+        return default
     q = concept_id.strip().lower()
-    for c in CONTENT:
-        if c.get("id") == q or c.get("title", "").lower() == q:
+    if q in CONTENT:
+        return CONTENT[q]
+    for c in CONCEPTS:
+        if c.get("title", "").lower() == q:
             return c
-    return CONTENT[0]
+    return default
 
 @function_tool
 async def switch_mode(ctx: RunContext, mode: str) -> str:
@@ -66,30 +82,29 @@ async def switch_mode(ctx: RunContext, mode: str) -> str:
     m = mode.strip().lower()
     if m not in VOICE_MAP:
         return f"unknown_mode:{m}"
-    logger.info(f"Mode switch requested: {m}")
+    logger.info("Mode switch requested: %s", m)
     return f"switched:{m}"
 
+_CONTENT_LIST = "\n".join(f"- {c.get('id')}: {c.get('title')}" for c in CONCEPTS)
+
+_INSTRUCTIONS = (
+    "You are an Active Recall Coach called 'Teach-the-Tutor'.\n"
+    "Your job: greet the user, ask for their preferred mode (learn, quiz, teach_back), "
+    "and then run short, focused interactions using the course content provided.\n"
+    "Be concise, supportive, and avoid any medical or diagnostic advice.\n"
+    "Available concepts:\n"
+    f"{_CONTENT_LIST}\n"
+    "Behavior rules:\n"
+    "- learn: explain the concept in simple language (use the concept 'summary').\n"
+    "- quiz: ask the sample_question and accept a short answer, then give a short reflection.\n"
+    "- teach_back: ask the user to explain the concept back and give brief qualitative feedback.\n"
+    "You may call get_concept(concept_id) to fetch a concept and switch_mode(mode) to change voice.\n"
+    "Always close a short interaction with a recap and ask 'Does this sound right?'."
+)
+
 class TeachTheTutorAgent(Agent):
     def __init__(self, initial_mode: str = "learn") -> None:
-        summary_texts = [f"- {c.get('id')}: {c.get('title')}" for c in CONTENT]
-        content_list = "\n".join(summary_texts)
-
-        instructions = (
-            "You are an Active Recall Coach called 'Teach-the-Tutor'.\n"
-            "Your job: greet the user, ask for their preferred mode (learn, quiz, teach_back), "
-            "and then run short, focused interactions using the course content provided.\n"
-            "Be concise, supportive, and avoid any medical or diagnostic advice.\n"
-            "Available concepts:\n"
-            f"{content_list}\n"
-            "Behavior rules:\n"
-            "- learn: explain the concept in simple language (use the concept 'summary').\n"
-            "- quiz: ask the sample_question and accept a short answer, then give a short reflection.\n"
-            "- teach_back: ask the user to explain the concept back and give brief qualitative feedback.\n"
-            "You may call get_concept(concept_id) to fetch a concept and switch_mode(mode) to change voice.\n"
-            "Always close a short interaction with a recap and ask 'Does this sound right?'."
-        )
-
-        super().__init__(instructions=instructions, tools=[get_concept, switch_mode])
+        super().__init__(instructions=_INSTRUCTIONS, tools=[get_concept, switch_mode])
 
 def prewarm(proc: JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
@@ -121,7 +136,7 @@ async def entrypoint(ctx: JobContext):
 
     async def log_usage():
         summary = usage_collector.get_summary()
-        logger.info(f"Usage: {summary}")
+        logger.info("Usage: %s", summary)
 
     ctx.add_shutdown_callback(log_usage)
 
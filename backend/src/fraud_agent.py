@@ -1,8 +1,13 @@
+import asyncio
+import contextlib
 import logging
 import os
 import json
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import shutil
+import tempfile
+import threading
+import time
+from typing import Optional, List, Dict, Any, Tuple
 
 from dotenv import load_dotenv
 from livekit.agents import (
@@ -22,6 +27,11 @@ from livekit.agents import (
 from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 logger = logging.getLogger("fraud_agent")
 
 load_dotenv(".env.local")
@@ -35,29 +45,79 @@ DB_PATH = os.path.abspath(
 )
 
 
-def _read_db() -> List[Dict[str, Any]]:
-    """Read DB safely and always return a list."""
-    if not os.path.exists(DB_PATH):
-        return []
+# Parsed DB kept in memory as one (file key, cases, index by name) snapshot,
+# swapped as a whole so readers never see a list and index from different loads.
+# The file key includes the inode because os.replace() from another process can
+# land within the same mtime tick.
+_EMPTY_DB: Tuple[Any, List[Dict[str, Any]], Dict[str, Dict[str, Any]]] = (None, [], {})
+_DB_CACHE: Dict[str, Any] = {"snapshot": _EMPTY_DB}
+
+# Serializes update_case's read-modify-write cycles between threads of this
+# process. A plain threading lock isn't bound to any event loop.
+_DB_WRITE_LOCK = threading.Lock()
+
+
+def _load_db() -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Return the cases and their lowercased-userName index from one load."""
+    try:
+        st = os.stat(DB_PATH)
+    except OSError:
+        _DB_CACHE["snapshot"] = _EMPTY_DB
+        return [], {}
+
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached_key, data, by_name = _DB_CACHE["snapshot"]
+    if key == cached_key:
+        return data, by_name
 
     try:
         with open(DB_PATH, "r", encoding="utf-8") as f:
             data = json.load(f)
-            return data if isinstance(data, list) else []
     except Exception as e:
-        logger.error(f"Error reading database: {e}")
-        return []
+        logger.error("Error reading database: %s", e)
+        _DB_CACHE["snapshot"] = _EMPTY_DB
+        return [], {}
+
+    data = data if isinstance(data, list) else []
+    by_name = {}
+    for c in data:
+        # First match wins, same as the linear scans this index replaces.
+        by_name.setdefault(c.get("userName", "").lower(), c)
+    _DB_CACHE["snapshot"] = (key, data, by_name)
+    return data, by_name
+
+
+def _read_db() -> List[Dict[str, Any]]:
+    """Read DB safely and always return a list."""
+    return _load_db()[0]
+
+
+def _read_db_index() -> Dict[str, Dict[str, Any]]:
+    """Return the cached cases keyed by lowercased userName."""
+    return _load_db()[1]
 
 
-def _write_db(data: List[Dict[str, Any]]):
+def _write_db(data: List[Dict[str, Any]]) -> bool:
     """Atomic write to prevent corruption during concurrent updates."""
-    tmp_path = DB_PATH + ".tmp"
+    tmp_path = None
     try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=".fraud_cases.", suffix=".tmp", dir=os.path.dirname(DB_PATH)
+        )
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        with contextlib.suppress(FileNotFoundError):
+            shutil.copymode(DB_PATH, tmp_path)
         os.replace(tmp_path, DB_PATH)
     except Exception as e:
-        logger.error(f"Failed to write DB: {e}")
+        logger.error("Failed to write DB: %s", e)
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+    # Only drop the cache once the new file is in place; the next read reloads it.
+    _DB_CACHE["snapshot"] = _EMPTY_DB
+    return True
 
 
 # ---------------------------------------------------------------------------
@@ -71,11 +131,7 @@ async def load_case(ctx: RunContext, userName: str) -> Optional[dict]:
     if not userName:
         return None
 
-    for case in _read_db():
-        if case.get("userName", "").lower() == userName:
-            return case
-
-    return None
+    return _read_db_index().get(userName)
 
 
 @function_tool
@@ -91,78 +147,113 @@ async def verify_answer(ctx: RunContext, userName: str, answer: str) -> bool:
     return answer == expected
 
 
+@contextlib.contextmanager
+def _db_write_lock():
+    """Hold the DB write lock across threads and, where flock exists, processes.
+
+    Each LiveKit job runs in its own worker process, so the thread lock alone
+    only covers one session; the flock on a sidecar file covers the rest.
+    """
+    with _DB_WRITE_LOCK:
+        if fcntl is None:
+            yield
+            return
+        with open(DB_PATH + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _update_case_sync(user_name: str, status: str, outcome_note: str) -> str:
+    """Read-modify-write one case under the DB write lock."""
+    with _db_write_lock():
+        # Read once: the index belongs to exactly this list, and a failed read
+        # returns both empty so nothing is written back.
+        cases, by_name = _load_db()
+        c = by_name.get(user_name)
+        if c is None:
+            return "error:not_found"
+
+        # Cached cases are shared with every caller, so edit a copy and leave
+        # the cache alone until the write has landed.
+        updated = {
+            **c,
+            "status": status,
+            "history": [*c.get("history", []), {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()),
+                "note": outcome_note,
+            }],
+        }
+        cases = [updated if x is c else x for x in cases]
+
+        if not _write_db(cases):
+            return "error:write_failed"
+
+    return f"saved:{DB_PATH}"
+
+
 @function_tool
 async def update_case(ctx: RunContext, userName: str, status: str, outcomeNote: str) -> str:
     """Update status + append history entry."""
     userName = (userName or "").strip().lower()
-    cases = _read_db()
-
-    for c in cases:
-        if c.get("userName", "").lower() == userName:
 
-            c["status"] = status
-            c.setdefault("history", [])
-            c["history"].append({
-                "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
-                "note": outcomeNote,
-            })
-
-            _write_db(cases)
-            return f"saved:{DB_PATH}"
-
-    return "error:not_found"
+    # Keep disk I/O and lock waits off the event loop so audio keeps flowing.
+    return await asyncio.to_thread(_update_case_sync, userName, status, outcomeNote)
 
 
 # ---------------------------------------------------------------------------
 # Agent Behaviour
 # ---------------------------------------------------------------------------
 
+_INSTRUCTIONS = (
+    "You are a calm, clear, highly professional fraud specialist from the fictional bank 'Acme Trust'. "
+    "Your job is to assist customers with verifying a suspicious transaction on their account.\n\n"
+
+    "Conversation Flow:\n"
+    "1. Greet warmly and introduce yourself as Acme Trust's Fraud Prevention Department.\n"
+    "2. Explain that you're calling regarding a potentially suspicious transaction.\n"
+    "3. Ask for the customer’s FIRST NAME only.\n"
+    "4. Use `load_case(userName)` to retrieve their case.\n"
+    "   - If no case exists, politely say you cannot find their profile and end the call.\n\n"
+
+    "Verification Step:\n"
+    "5. Once case is loaded, ask ONLY the stored non-sensitive verification question.\n"
+    "6. After customer answers, call `verify_answer(userName, answer)`.\n"
+    "   - If verification fails, update with `verification_failed` and end the call.\n\n"
+
+    "Transaction Review:\n"
+    "7. If verification succeeds, read the suspicious transaction details clearly:\n"
+    "   - Merchant Name\n"
+    "   - Amount\n"
+    "   - Masked card ending\n"
+    "   - Timestamp\n"
+    "   - Category\n"
+    "   - Source website/app\n"
+    "8. Ask: “Did you make this transaction?”\n\n"
+
+    "Outcome Handling:\n"
+    "- If customer says YES: call\n"
+    "  `update_case(userName, \"confirmed_safe\", \"Customer confirmed legitimate transaction.\")`\n"
+    "  and explain the case is closed.\n"
+    "- If customer says NO: call\n"
+    "  `update_case(userName, \"confirmed_fraud\", \"Customer reports fraudulent transaction; card blocked & dispute opened.\")`\n"
+    "  and reassure them their card is blocked and a dispute has been opened.\n\n"
+
+    "Behavior Rules:\n"
+    "- NEVER request sensitive info: no full card numbers, PINs, OTPs, SSNs, passwords, or addresses.\n"
+    "- Maintain a calm, supportive, trustworthy tone.\n"
+    "- Keep responses concise, friendly, and easy to understand.\n"
+    "- If the user seems confused, gently restate the question.\n"
+    "- Do not break character.\n"
+)
+
+
 class FraudAgent(Agent):
     def __init__(self) -> None:
-        instructions = (
-            "You are a calm, clear, highly professional fraud specialist from the fictional bank 'Acme Trust'. "
-            "Your job is to assist customers with verifying a suspicious transaction on their account.\n\n"
-
-            "Conversation Flow:\n"
-            "1. Greet warmly and introduce yourself as Acme Trust's Fraud Prevention Department.\n"
-            "2. Explain that you're calling regarding a potentially suspicious transaction.\n"
-            "3. Ask for the customer’s FIRST NAME only.\n"
-            "4. Use `load_case(userName)` to retrieve their case.\n"
-            "   - If no case exists, politely say you cannot find their profile and end the call.\n\n"
-
-            "Verification Step:\n"
-            "5. Once case is loaded, ask ONLY the stored non-sensitive verification question.\n"
-            "6. After customer answers, call `verify_answer(userName, answer)`.\n"
-            "   - If verification fails, update with `verification_failed` and end the call.\n\n"
-
-            "Transaction Review:\n"
-            "7. If verification succeeds, read the suspicious transaction details clearly:\n"
-            "   - Merchant Name\n"
-            "   - Amount\n"
-            "   - Masked card ending\n"
-            "   - Timestamp\n"
-            "   - Category\n"
-            "   - Source website/app\n"
-            "8. Ask: “Did you make this transaction?”\n\n"
-
-            "Outcome Handling:\n"
-            "- If customer says YES: call\n"
-            "  `update_case(userName, \"confirmed_safe\", \"Customer confirmed legitimate transaction.\")`\n"
-            "  and explain the case is closed.\n"
-            "- If customer says NO: call\n"
-            "  `update_case(userName, \"confirmed_fraud\", \"Customer reports fraudulent transaction; card blocked & dispute opened.\")`\n"
-            "  and reassure them their card is blocked and a dispute has been opened.\n\n"
-
-            "Behavior Rules:\n"
-            "- NEVER request sensitive info: no full card numbers, PINs, OTPs, SSNs, passwords, or addresses.\n"
-            "- Maintain a calm, supportive, trustworthy tone.\n"
-            "- Keep responses concise, friendly, and easy to understand.\n"
-            "- If the user seems confused, gently restate the question.\n"
-            "- Do not break character.\n"
-        )
-
         super().__init__(
-            instructions=instructions,
+            instructions=_INSTRUCTIONS,
             tools=[load_case, verify_answer, update_case]
         )
 
@@ -202,7 +293,7 @@ async def entrypoint(ctx: JobContext):
         usage_collector.collect(ev.metrics)
 
     async def log_usage():
-        logger.info(f"Usage Summary: {usage_collector.get_summary()}")
+        logger.info("Usage Summary: %s", usage_collector.get_summary())
 
     ctx.add_shutdown_callback(log_usage)
 
@@ -1,24 +1,45 @@
 # src/wellness_agent.py
-import json, datetime, os
+import json, os, time
 
-LOG_FILE = "wellness_log.json"
+LOG_FILE = "wellness_log.jsonl"
 
 def load_logs():
     if os.path.exists(LOG_FILE):
         with open(LOG_FILE, "r") as f:
-            return json.load(f)
+            return [json.loads(line) for line in f if line.strip()]
     return []
 
+def tail_lines(path, n):
+    # Read backwards from the end until we hold n complete lines.
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        chunks = []
+        newlines = 0
+        while pos > 0 and newlines <= n:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            newlines += chunk.count(b"\n")
+            chunks.append(chunk)
+    buf = b"".join(reversed(chunks))
+    return [line for line in buf.splitlines() if line.strip()][-n:]
+
 def save_entry(entry):
-    logs = load_logs()
-    logs.append(entry)
-    with open(LOG_FILE, "w") as f:
-        json.dump(logs, f, indent=2)
+    line = (json.dumps(entry) + "\n").encode("utf-8")
+    with open(LOG_FILE, "a+b") as f:
+        # A hand-edited log may lack its final newline; don't glue two records together.
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
 
 def generate_prompt():
-    logs = load_logs()
-    if logs:
-        last = logs[-1]
+    last_lines = tail_lines(LOG_FILE, 1) if os.path.exists(LOG_FILE) else []
+    if last_lines:
+        last = json.loads(last_lines[-1])
         ref = f"Last time you said you felt {last['mood']} and planned {', '.join(last['goals'])}. "
     else:
         ref = ""
@@ -29,7 +50,7 @@ def generate_prompt():
 
 def handle_checkin(mood, goals):
     entry = {
-        "timestamp": datetime.datetime.now().isoformat(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
         "mood": mood,
         "goals": goals,
         "summary": f"Mood: {mood}, goals: {', '.join(goals)}",
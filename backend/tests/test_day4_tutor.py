@@ -0,0 +1,29 @@
+import day4_tutor
+
+
+def test_index_by_id_keeps_first_concept_per_id() -> None:
+    concepts = (
+        {"id": "loops", "title": "Loops"},
+        {"title": "Untitled"},
+        {"id": "loops", "title": "Loops again"},
+    )
+
+    by_id = day4_tutor.index_by_id(concepts)
+
+    assert list(by_id) == ["loops"]
+    assert by_id["loops"]["title"] == "Loops"
+
+
+async def test_get_concept_by_id_title_and_default() -> None:
+    first = day4_tutor.CONCEPTS[0]
+    loops = day4_tutor.CONTENT["loops"]
+
+    assert await day4_tutor.get_concept(None) is first
+    assert await day4_tutor.get_concept(None, " LOOPS ") is loops
+    assert await day4_tutor.get_concept(None, loops["title"]) is loops
+    assert await day4_tutor.get_concept(None, "no-such-concept") is first
+
+
+def test_prompt_lists_every_concept() -> None:
+    for c in day4_tutor.CONCEPTS:
+        assert f"- {c.get('id')}: {c.get('title')}" in day4_tutor._INSTRUCTIONS
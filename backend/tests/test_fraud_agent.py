@@ -0,0 +1,159 @@
+import asyncio
+import json
+import multiprocessing
+import os
+
+import pytest
+
+import fraud_agent
+
+CASES = [
+    {"userName": "John", "securityAnswer": "springfield", "status": "pending_review"},
+    {"userName": "Alice", "securityAnswer": "paris", "status": "pending_review"},
+    {"userName": "JOHN", "securityAnswer": "duplicate", "status": "duplicate"},
+]
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "fraud_cases.json"
+    path.write_text(json.dumps(CASES), encoding="utf-8")
+    monkeypatch.setattr(fraud_agent, "DB_PATH", str(path))
+    monkeypatch.setattr(fraud_agent, "_DB_CACHE", {"snapshot": fraud_agent._EMPTY_DB})
+    return path
+
+
+def _bump_mtime(path) -> None:
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_read_db_is_cached_until_mtime_changes(db_path) -> None:
+    first = fraud_agent._read_db()
+    assert fraud_agent._read_db() is first
+
+    db_path.write_text(json.dumps(CASES[:1]), encoding="utf-8")
+    _bump_mtime(db_path)
+
+    reloaded = fraud_agent._read_db()
+    assert reloaded is not first
+    assert [c["userName"] for c in reloaded] == ["John"]
+
+
+def test_read_db_reloads_file_replaced_within_same_mtime(db_path) -> None:
+    first = fraud_agent._read_db()
+    st = os.stat(db_path)
+
+    # Same size and mtime as the original; only the inode differs.
+    replacement = db_path.with_name("replacement.json")
+    replacement.write_text(
+        json.dumps(CASES).replace("pending_review", "PENDING_REVIEW", 1),
+        encoding="utf-8",
+    )
+    os.utime(replacement, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(replacement, db_path)
+
+    reloaded = fraud_agent._read_db()
+    assert reloaded is not first
+    assert reloaded[0]["status"] == "PENDING_REVIEW"
+
+
+async def test_index_first_match_wins(db_path) -> None:
+    assert fraud_agent._read_db_index()["john"]["status"] == "pending_review"
+
+    case = await fraud_agent.load_case(None, "  jOhN ")
+    assert case["securityAnswer"] == "springfield"
+
+
+async def test_update_case_persists_and_refreshes_cache(db_path) -> None:
+    result = await fraud_agent.update_case(None, "alice", "confirmed_safe", "ok")
+    assert result == f"saved:{db_path}"
+
+    on_disk = json.loads(db_path.read_text(encoding="utf-8"))
+    assert on_disk[1]["status"] == "confirmed_safe"
+    assert on_disk[1]["history"][-1]["note"] == "ok"
+    assert (await fraud_agent.load_case(None, "alice"))["status"] == "confirmed_safe"
+
+
+async def test_failed_write_leaves_cache_untouched(db_path, monkeypatch) -> None:
+    before = db_path.read_text(encoding="utf-8")
+
+    def _fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", _fail)
+    result = await fraud_agent.update_case(None, "alice", "confirmed_fraud", "no")
+
+    assert result == "error:write_failed"
+    assert db_path.read_text(encoding="utf-8") == before
+    case = await fraud_agent.load_case(None, "alice")
+    assert case["status"] == "pending_review"
+    assert "history" not in case
+
+
+async def test_concurrent_updates_all_persist(db_path) -> None:
+    results = await asyncio.gather(
+        fraud_agent.update_case(None, "john", "confirmed_safe", "a"),
+        fraud_agent.update_case(None, "alice", "confirmed_fraud", "b"),
+        *(fraud_agent.update_case(None, "john", "confirmed_safe", str(i)) for i in range(20)),
+    )
+    assert all(r.startswith("saved:") for r in results)
+
+    on_disk = json.loads(db_path.read_text(encoding="utf-8"))
+    assert on_disk[0]["status"] == "confirmed_safe"
+    assert len(on_disk[0]["history"]) == 21
+    assert on_disk[1]["status"] == "confirmed_fraud"
+    assert sorted(os.listdir(db_path.parent)) == [db_path.name, db_path.name + ".lock"]
+
+
+def _update_many(db_path: str, user: str, count: int) -> None:
+    fraud_agent.DB_PATH = db_path
+    fraud_agent._DB_CACHE["snapshot"] = fraud_agent._EMPTY_DB
+    for i in range(count):
+        result = fraud_agent._update_case_sync(user, "confirmed_safe", str(i))
+        assert result.startswith("saved:")
+
+
+@pytest.mark.skipif(fraud_agent.fcntl is None, reason="needs fcntl.flock")
+def test_updates_from_separate_processes_all_persist(db_path) -> None:
+    ctx = multiprocessing.get_context("fork")
+    workers = [
+        ctx.Process(target=_update_many, args=(str(db_path), user, 25))
+        for user in ("john", "alice")
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(timeout=60)
+        assert w.exitcode == 0
+
+    on_disk = json.loads(db_path.read_text(encoding="utf-8"))
+    assert len(on_disk[0]["history"]) == 25
+    assert len(on_disk[1]["history"]) == 25
+
+
+def test_update_case_works_across_event_loops(db_path) -> None:
+    # The DB lock must not be tied to the loop that first contended for it.
+    async def _contend(status: str) -> None:
+        await asyncio.gather(
+            fraud_agent.update_case(None, "john", status, "a"),
+            fraud_agent.update_case(None, "john", status, "b"),
+        )
+
+    for status in ("confirmed_safe", "confirmed_fraud"):
+        asyncio.run(_contend(status))
+
+    on_disk = json.loads(db_path.read_text(encoding="utf-8"))
+    assert on_disk[0]["status"] == "confirmed_fraud"
+    assert len(on_disk[0]["history"]) == 4
+
+
+async def test_update_case_never_writes_after_failed_read(db_path) -> None:
+    assert fraud_agent._read_db_index()["john"]
+
+    db_path.write_text("[{ not json", encoding="utf-8")
+    _bump_mtime(db_path)
+
+    result = await fraud_agent.update_case(None, "john", "confirmed_safe", "ok")
+    assert result == "error:not_found"
+    assert db_path.read_text(encoding="utf-8") == "[{ not json"
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+import wellness_agent
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    path = tmp_path / "wellness_log.jsonl"
+    monkeypatch.setattr(wellness_agent, "LOG_FILE", str(path))
+    return path
+
+
+def test_tail_lines_empty_file(tmp_path) -> None:
+    path = tmp_path / "empty.jsonl"
+    path.write_bytes(b"")
+    assert wellness_agent.tail_lines(str(path), 3) == []
+
+
+def test_tail_lines_without_trailing_newline(tmp_path) -> None:
+    path = tmp_path / "log.jsonl"
+    path.write_bytes(b"a\nb\nc")
+    assert wellness_agent.tail_lines(str(path), 2) == [b"b", b"c"]
+    assert wellness_agent.tail_lines(str(path), 5) == [b"a", b"b", b"c"]
+
+
+def test_tail_lines_line_longer_than_chunk(tmp_path) -> None:
+    path = tmp_path / "log.jsonl"
+    long_line = b"x" * 10_000
+    path.write_bytes(b"first\n" + long_line + b"\nlast\n")
+    assert wellness_agent.tail_lines(str(path), 2) == [long_line, b"last"]
+    assert wellness_agent.tail_lines(str(path), 3)[0] == b"first"
+
+
+def test_save_entry_starts_new_line_after_unterminated_record(log_file) -> None:
+    log_file.write_text(json.dumps({"mood": "okay", "goals": ["walk"]}))
+
+    wellness_agent.save_entry({"mood": "good", "goals": ["read"]})
+
+    assert [e["mood"] for e in wellness_agent.load_logs()] == ["okay", "good"]
+    assert log_file.read_text().endswith("\n")
+
+
+def test_generate_prompt_uses_last_entry(log_file) -> None:
+    assert wellness_agent.generate_prompt().startswith("Let's do today's")
+
+    wellness_agent.handle_checkin("tired", ["sleep"])
+    wellness_agent.handle_checkin("great", ["run", "cook"])
+
+    assert wellness_agent.generate_prompt().startswith(
+        "Last time you said you felt great and planned run, cook."
+    )